@@ -8,31 +8,76 @@ Usage:
     python main.py /path/to/smoking_health_data_final.csv --filter smoker
 """
 from __future__ import annotations
-import argparse, sys, json
-from typing import List
-from participant import load_participants, summarize, Participant
+import argparse, itertools, sys, json
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+from participant import iter_participants, load_participants, load_table, summarize, Participant
+
+try:  # Optional faster JSON encoder; the standard library is used when it is absent.
+    import orjson
+except ImportError:
+    orjson = None
+
+def _dumps(obj: object) -> str:
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode("utf-8")
+    # allow_nan=False matches orjson, which has no NaN/Infinity tokens.
+    return json.dumps(obj, indent=2, allow_nan=False)
+
+# Sample-row predicates, chosen once per run from --filter.
+_KEEPERS: Dict[str, Callable[[Participant], bool]] = {
+    "all": lambda p: True,
+    "smoker": lambda p: p.current_smoker is True,
+    "nonsmoker": lambda p: p.current_smoker is False,
+}
+
+# --filter -> required ParticipantTable.current_smoker code (None: any row).
+_SMOKER_CODES: Dict[str, Optional[int]] = {"all": None, "smoker": 1, "nonsmoker": 0}
+
+def _sampled(participants: Iterable[Participant], keep: Callable[[Participant], bool],
+             limit: int, sample: List[Participant]) -> Iterator[Participant]:
+    """Pass participants through unchanged, appending the first `limit` kept ones to sample."""
+    for p in participants:
+        if len(sample) < limit and keep(p):
+            sample.append(p)
+        yield p
 
 def parse_args(argv: List[str]) -> argparse.Namespace:
     p = argparse.ArgumentParser(description="Participant loader and quick analyzer")
     p.add_argument("csv_path", help="Path to the dataset CSV")
     p.add_argument("--limit", type=int, default=5, help="Show the first N participants (default: 5)")
-    p.add_argument("--filter", choices=["all", "smoker", "nonsmoker"], default="all",
+    p.add_argument("--filter", choices=list(_KEEPERS), default="all",
                    help="Optionally filter the printed sample rows")
+    p.add_argument("--cache", action="store_true",
+                   help="Cache the parsed columns next to the CSV and reuse them on later runs")
+    p.add_argument("--workers", type=int, default=1,
+                   help="Parse CSV files of 8 MiB or more with N processes (default: 1)")
     return p.parse_args(argv)
 
 def main(argv: List[str]) -> int:
     args = parse_args(argv)
-    participants = load_participants(args.csv_path)
     # Optional filtering for the sample printout
-    def keep(p: Participant) -> bool:
-        if args.filter == "smoker":
-            return p.current_smoker is True
-        if args.filter == "nonsmoker":
-            return p.current_smoker is False
-        return True
-
-    sample = [p for p in participants if keep(p)][: max(0, args.limit)]
-    print(f"Loaded {len(participants)} participants")
+    keep = _KEEPERS[args.filter]
+
+    limit = max(0, args.limit)
+    if args.cache:
+        table = load_table(args.csv_path, cache=True, workers=args.workers)
+        summary = summarize(table)
+        # Pick sample rows off the smoker column; only those rows are rebuilt.
+        code = _SMOKER_CODES[args.filter]
+        rows = (i for i, c in enumerate(table.current_smoker) if code is None or c == code)
+        sample = [table.participant(i) for i in itertools.islice(rows, limit)]
+    else:
+        # One streaming pass: the sample is taken while the summary is computed,
+        # so the file is read once and no full participant list is kept in memory.
+        # --workers > 1 trades the streaming for a parallel parse of the whole file.
+        participants: Iterable[Participant]
+        if args.workers > 1:
+            participants = load_participants(args.csv_path, workers=args.workers)
+        else:
+            participants = iter_participants(args.csv_path)
+        sample = []
+        summary = summarize(_sampled(participants, keep, limit, sample))
+    print(f"Loaded {summary['count']} participants")
     if sample:
         print(f"\nSample ({len(sample)} shown):")
         for i, p in enumerate(sample, 1):
@@ -40,7 +85,7 @@ def main(argv: List[str]) -> int:
 
     # Show JSON summary for easy automated checking
     print("\nSummary:")
-    print(json.dumps(summarize(participants), indent=2))
+    print(_dumps(summary))
     return 0
 
 if __name__ == "__main__":
@@ -1,6 +1,9 @@
 # Minimal quick checks (optional).
 # Run with: python -m pytest -q       (if pytest is available)
-from participant import row_to_participant, BloodPressure
+from participant import (
+    row_to_participant, load_participants, summarize, bp_category_codes,
+    load_table, BloodPressure, ParticipantTable, BP_CATEGORIES, TABLE_CACHE_SUFFIX,
+)
 
 def test_bp_parse_and_category():
     p = row_to_participant({"blood_pressure": "127.5/76"})
@@ -12,3 +15,137 @@ def test_bool_parse():
     assert p.current_smoker is True
     p = row_to_participant({"current_smoker": "no"})
     assert p.current_smoker is False
+
+def test_table_round_trip_and_summary():
+    rows = [
+        {"age": "50", "sex": "Male", "current_smoker": "yes", "blood_pressure": "150/95", "chol": "200"},
+        {"age": "", "current_smoker": "", "blood_pressure": "110/70", "cigs_per_day": "3"},
+    ]
+    ps = [row_to_participant(r) for r in rows]
+    t = ParticipantTable.from_participants(ps)
+    assert len(t) == 2
+    assert list(t) == ps
+    assert summarize(t) == summarize(ps)
+    assert summarize(t)["stage2_bp_count"] == 1
+    assert summarize(t)["normal_bp_count"] == 1
+
+def test_bp_category_codes_match_scalar():
+    pairs = [(110, 70), (125, 75), (135, 70), (115, 85), (150, 70), (110, 95), (float("nan"), 70)]
+    codes = bp_category_codes([s for s, _ in pairs], [d for _, d in pairs])
+    assert [BP_CATEGORIES[c] for c in codes] == [BloodPressure(s, d).category() for s, d in pairs]
+    assert BP_CATEGORIES[codes[-1]] == "Uncategorized"
+
+def test_load_reorders_and_tolerates_missing_columns(tmp_path):
+    path = tmp_path / "data.csv"
+    path.write_text("chol,extra,age,current_smoker\n210,x,44,yes\n\n,y,,no\n", encoding="utf-8")
+    ps = load_participants(str(path))
+    assert len(ps) == 2
+    assert (ps[0].age, ps[0].chol, ps[0].current_smoker, ps[0].sex) == (44, 210.0, True, None)
+    assert (ps[1].age, ps[1].chol, ps[1].current_smoker) == (None, None, False)
+
+def test_parallel_load_matches_serial(tmp_path, monkeypatch):
+    import participant
+    path = tmp_path / "data.csv"
+    rows = [f"{40 + i % 30},{'male' if i % 2 else 'female'},{'yes' if i % 3 else 'no'},{60 + i % 40},"
+            f"{100 + i % 60}/{60 + i % 40},{i % 25},{150 + i}" for i in range(200)]
+    path.write_text("age,sex,current_smoker,heart_rate,blood_pressure,cigs_per_day,chol\n"
+                    + "\n".join(rows) + "\n", encoding="utf-8")
+    monkeypatch.setattr(participant, "_PARALLEL_MIN_BYTES", 0)
+    assert load_participants(str(path), workers=3) == load_participants(str(path), workers=1)
+
+def test_summarize_consumes_a_generator():
+    rows = [{"current_smoker": "yes", "chol": "200", "blood_pressure": "150/95"},
+            {"current_smoker": "no", "chol": "", "blood_pressure": "110/70"}]
+    ps = [row_to_participant(r) for r in rows]
+    assert summarize(row_to_participant(r) for r in rows) == summarize(ParticipantTable.from_participants(ps))
+
+def test_table_and_stream_summaries_agree_on_fractional_values():
+    rows = [
+        {"blood_pressure": "119.9999999/70", "chol": "236.7"},
+        {"blood_pressure": "139.9999999/85", "chol": "201.3"},
+        {"blood_pressure": "129.99999999/79.9999999", "chol": "199.9"},
+    ]
+    ps = [row_to_participant(r) for r in rows]
+    t = ParticipantTable.from_participants(ps)
+    assert summarize(t) == summarize(iter(ps))
+    assert summarize(t)["normal_bp_count"] == 1
+    assert summarize(t)["stage2_bp_count"] == 0
+
+def test_table_stores_out_of_range_age_as_missing():
+    ps = [row_to_participant({"age": a}) for a in ("40000", "3000000000", "-3", "55")]
+    assert [p.age for p in ParticipantTable.from_participants(ps)] == [40000, None, None, 55]
+
+def test_load_table_reuses_cache(tmp_path):
+    path = tmp_path / "data.csv"
+    path.write_text("age,sex,current_smoker,chol\n44,Male,yes,210.5\n51,,no,nan\n", encoding="utf-8")
+    first = load_table(str(path), cache=True)
+    cache_path = tmp_path / ("data.csv" + TABLE_CACHE_SUFFIX)
+    assert cache_path.exists()
+    second = load_table(str(path), cache=True)
+    assert list(second.age) == list(first.age) == [44, 51]
+    assert second.sex == ["male", None]
+    assert summarize(second) == summarize(load_participants(str(path)))
+    assert summarize(second)["average_cholesterol"] == 210.5
+
+def test_load_table_ignores_corrupt_cache(tmp_path):
+    path = tmp_path / "data.csv"
+    path.write_text("age,chol\n44,210\n", encoding="utf-8")
+    cache_path = tmp_path / ("data.csv" + TABLE_CACHE_SUFFIX)
+    for junk in (b"\x80\x04\x95\xff garbage", b'{"version": 1}\n', b""):
+        cache_path.write_bytes(junk)
+        assert list(load_table(str(path), cache=True).age) == [44]
+
+def test_smoker_status_cache_distinguishes_bool_from_int():
+    from participant import _smoker_status
+    assert _smoker_status(True, 5.0) == "Moderate smoker"
+    assert _smoker_status(1, 5.0) == "Unknown"
+
+def test_chunk_bounds_are_balanced(tmp_path):
+    from participant import _chunk_bounds
+    path = tmp_path / "data.csv"
+    path.write_bytes(b"header\n" + b"".join(b"%08d,row\n" % i for i in range(10000)))
+    with open(path, "rb") as f:
+        start = len(b"header\n")
+        size = path.stat().st_size
+        bounds = _chunk_bounds(f, start, size, 8)
+    assert len(bounds) == 8
+    assert bounds[0][0] == start and bounds[-1][1] == size
+    assert all(a[1] == b[0] for a, b in zip(bounds, bounds[1:]))
+    sizes = [e - s for s, e in bounds]
+    assert max(sizes) - min(sizes) <= 2 * len(b"00000000,row\n")
+
+def test_bp_parse_ignores_inner_spaces():
+    p = row_to_participant({"blood_pressure": "1 20 / 8 0"})
+    assert p.blood_pressure == BloodPressure(120.0, 80.0)
+
+def test_summary_json_is_the_same_with_either_encoder(monkeypatch):
+    import main
+    rows = [{"chol": "inf"}, {"chol": "200"}]
+    summary = summarize(row_to_participant(r) for r in rows)
+    assert summary["average_cholesterol"] is None
+    monkeypatch.setattr(main, "orjson", None)
+    stdlib_text = main._dumps(summary)
+    monkeypatch.undo()
+    if main.orjson is not None:
+        assert main._dumps(summary) == stdlib_text
+
+def test_load_table_rejects_cache_for_replaced_csv(tmp_path):
+    import os
+    path = tmp_path / "data.csv"
+    path.write_text("age\n44\n", encoding="utf-8")
+    assert len(load_table(str(path), cache=True)) == 1
+    old = os.stat(path).st_mtime_ns
+    path.write_text("age\n44\n51\n", encoding="utf-8")
+    os.utime(path, ns=(old - 10**9, old - 10**9))  # replacement carries an older mtime
+    assert list(load_table(str(path), cache=True).age) == [44, 51]
+
+def test_failed_cache_write_leaves_no_temp_file(tmp_path, monkeypatch):
+    import os
+    path = tmp_path / "data.csv"
+    path.write_text("age\n44\n", encoding="utf-8")
+
+    def fail_replace(src, dst):
+        raise OSError("simulated")
+    monkeypatch.setattr(os, "replace", fail_replace)
+    assert len(load_table(str(path), cache=True)) == 1
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["data.csv"]